@@ -1,9 +1,10 @@
 """Utility modules for PM Intelligence Platform."""
 
-from pm_intelligence.utils.batch_processor import BatchProcessor
+from pm_intelligence.utils.batch_processor import Batch, BatchProcessor
 from pm_intelligence.utils.cache_manager import CacheManager
 from pm_intelligence.utils.config import Config, get_config
-from pm_intelligence.utils.resource_manager import (RateLimitConfig,
+from pm_intelligence.utils.resource_manager import (Availability,
+                                                    RateLimitConfig,
                                                     ResourceContext,
                                                     ResourceManager)
 
@@ -11,8 +12,10 @@ __all__ = [
     "Config",
     "get_config",
     "CacheManager",
+    "Batch",
     "BatchProcessor",
     "ResourceManager",
     "ResourceContext",
     "RateLimitConfig",
+    "Availability",
 ]
@@ -0,0 +1,13 @@
+"""Logging helpers shared by the utility modules."""
+
+import logging
+from typing import Any
+
+
+def debug_enabled(logger: Any) -> bool:
+    """Check a logger's level before building debug kwargs."""
+    # stdlib-backed loggers expose isEnabledFor, filtering loggers is_enabled_for
+    check = getattr(logger, "is_enabled_for", None) or getattr(
+        logger, "isEnabledFor", None
+    )
+    return check(logging.DEBUG) if check is not None else True
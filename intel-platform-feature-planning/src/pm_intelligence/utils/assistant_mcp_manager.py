@@ -4,61 +4,134 @@ Handles automatic startup and management of the assistant-mcp server
 """
 
 import asyncio
+import functools
 import os
 import signal
 import subprocess
+import threading
 import time
+from collections import deque
 from pathlib import Path
-from typing import Optional
+from typing import IO, Callable, Deque, Iterator, Optional, Set, Tuple
 
 import httpx
 
 
+@functools.cache
+def _discover_assistant_path() -> Optional[Path]:
+    """Find an assistant-mcp checkout in the common locations (probed once)"""
+    possible_paths = [
+        Path.home() / "Documents" / "repos" / "assistant-mcp",
+        Path.home() / "assistant-mcp",
+        Path.cwd().parent / "assistant-mcp",
+        Path("/Users/nvaldez/Documents/repos/assistant-mcp"),  # Your specific path
+    ]
+
+    for path in possible_paths:
+        if path.exists() and (path / "package.json").exists():
+            return path
+    return None
+
+
+def _drain_pipe(pipe: IO[bytes], tail: Deque[bytes]) -> None:
+    """Read a child pipe until EOF, keeping only its last lines"""
+    with pipe:
+        for line in iter(pipe.readline, b""):
+            tail.append(line)
+
+
 class AssistantMCPManager:
     """Manages the assistant-mcp server lifecycle"""
 
+    # Seconds to wait for a freshly started server to answer /health
+    STARTUP_TIMEOUT = 30
+
     def __init__(self, assistant_mcp_path: Optional[str] = None, port: int = 3001):
         self.port = port
         self.base_url = f"http://localhost:{port}"
         self.process: Optional[subprocess.Popen] = None
 
+        # Last stderr lines of the server process, drained in the background
+        self._stderr_tail: Deque[bytes] = deque(maxlen=50)
+        self._stderr_drain: Optional[threading.Thread] = None
+
+        # Shared HTTP clients for health probes (created lazily, reused across polls)
+        self._client: Optional[httpx.AsyncClient] = None
+        # Loop the async client was created on; its connections are bound to it
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sync_client: Optional[httpx.Client] = None
+        # Background aclose() calls started by stop_server; referenced until
+        # they finish so they aren't garbage collected while pending
+        self._closing: Set[asyncio.Task] = set()
+
         # Try to find assistant-mcp path
         if assistant_mcp_path:
             self.assistant_mcp_path = Path(assistant_mcp_path)
         else:
-            # Try common locations
-            possible_paths = [
-                Path.home() / "Documents" / "repos" / "assistant-mcp",
-                Path.home() / "assistant-mcp",
-                Path.cwd().parent / "assistant-mcp",
-                Path(
-                    "/Users/nvaldez/Documents/repos/assistant-mcp"
-                ),  # Your specific path
-            ]
-
-            for path in possible_paths:
-                if path.exists() and (path / "package.json").exists():
-                    self.assistant_mcp_path = path
-                    break
-            else:
-                self.assistant_mcp_path = None
+            self.assistant_mcp_path = _discover_assistant_path()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared health-probe client (lazy initialization)"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            # A client from an earlier (possibly closed) loop can't be reused;
+            # drop it and let its connections be released with that loop
+            self._client_loop = loop
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=2.0,
+                limits=httpx.Limits(max_keepalive_connections=2, max_connections=4),
+            )
+        return self._client
+
+    def _get_sync_client(self) -> httpx.Client:
+        """Get the shared blocking health-probe client (lazy initialization)"""
+        if self._sync_client is None:
+            self._sync_client = httpx.Client(
+                base_url=self.base_url,
+                timeout=2.0,
+                limits=httpx.Limits(max_keepalive_connections=1, max_connections=2),
+            )
+        return self._sync_client
+
+    def _close_sync_client(self) -> None:
+        """Close the shared blocking health-probe client"""
+        if self._sync_client is not None:
+            client, self._sync_client = self._sync_client, None
+            client.close()
+
+    async def close(self) -> None:
+        """Close the shared health-probe clients"""
+        self._close_sync_client()
+        if self._client is not None:
+            client, self._client = self._client, None
+            if self._client_loop is asyncio.get_running_loop():
+                await client.aclose()
+        loop = asyncio.get_running_loop()
+        closing = [task for task in self._closing if task.get_loop() is loop]
+        if closing:
+            await asyncio.gather(*closing, return_exceptions=True)
 
     async def is_server_running(self) -> bool:
         """Check if the assistant-mcp server is already running"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self.base_url}/health", timeout=2.0)
-                return response.status_code == 200
-        except:
+            response = await self._get_client().get("/health")
+            return response.status_code == 200
+        except (httpx.HTTPError, OSError):
+            # Connection refused / timed out while the server is down
             return False
 
-    async def start_server(self) -> bool:
-        """Start the assistant-mcp server if not already running"""
-        # Check if already running
-        if await self.is_server_running():
-            print(f"✅ Assistant-MCP server already running on port {self.port}")
-            return True
+    def is_server_running_sync(self) -> bool:
+        """Check if the server is running without an event loop"""
+        try:
+            response = self._get_sync_client().get("/health")
+            return response.status_code == 200
+        except (httpx.HTTPError, OSError):
+            # Connection refused / timed out while the server is down
+            return False
 
+    def _can_start(self) -> bool:
+        """Check that the assistant-mcp checkout is available to start from"""
         if not self.assistant_mcp_path or not self.assistant_mcp_path.exists():
             print(
                 f"❌ Could not find assistant-mcp directory. Please set ASSISTANT_MCP_PATH environment variable."
@@ -66,52 +139,187 @@ class AssistantMCPManager:
             return False
 
         print(f"🚀 Starting assistant-mcp server from {self.assistant_mcp_path}...")
+        return True
+
+    def _spawn_process(self) -> None:
+        """Launch the server process in its own process group"""
+        # Inherit the parent environment as-is unless PORT has to change
+        port = str(self.port)
+        env = None if os.environ.get("PORT") == port else {**os.environ, "PORT": port}
+
+        self.process = subprocess.Popen(
+            ["npm", "run", "start:api"],
+            cwd=str(self.assistant_mcp_path),
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            start_new_session=os.name != "nt",
+        )
+
+        # Keep stderr flowing so a chatty server never blocks on a full pipe
+        self._stderr_tail = deque(maxlen=50)
+        self._stderr_drain = threading.Thread(
+            target=_drain_pipe,
+            args=(self.process.stderr, self._stderr_tail),
+            name="assistant-mcp-stderr",
+            daemon=True,
+        )
+        self._stderr_drain.start()
+
+    def _report_exit(self) -> None:
+        """Print the output of a server process that exited during startup"""
+        if self._stderr_drain is not None:
+            self._stderr_drain.join(timeout=1)
+        stderr = b"".join(self._stderr_tail)
+        print(f"❌ Server failed to start:")
+        if stderr:
+            print(f"   Error: {stderr.decode()}")
+
+    def _startup_delays(self) -> Iterator[float]:
+        """
+        Yield how long to wait before each further readiness probe.
+
+        Delays back off from 50ms up to 1s, progress is printed every 5s,
+        and the iterator is exhausted once STARTUP_TIMEOUT has passed.
+        """
+        start = time.monotonic()
+        deadline = start + self.STARTUP_TIMEOUT
+        next_report = start + 5
+        delay = 0.05
+
+        while True:
+            now = time.monotonic()
+            if now >= deadline:
+                return
+            if now >= next_report:
+                print(
+                    f"   Waiting for server to start... "
+                    f"({int(now - start)}/{self.STARTUP_TIMEOUT}s)"
+                )
+                next_report += 5
+
+            yield delay
+            delay = min(delay * 1.5, 1.0)
+
+    def _startup_outcome(self, running: bool) -> Optional[bool]:
+        """Report a finished startup; None while the server is still coming up"""
+        if running:
+            print(f"✅ Assistant-MCP server started successfully on port {self.port}")
+            return True
+
+        # Check if process died
+        if self.process.poll() is not None:
+            self._report_exit()
+            return False
+
+        return None
+
+    def _startup_timed_out(self) -> bool:
+        """Stop a server that did not become ready in time"""
+        print(f"❌ Server failed to start within {self.STARTUP_TIMEOUT} seconds")
+        self.stop_server()
+        return False
+
+    async def start_server(self) -> bool:
+        """Start the assistant-mcp server if not already running"""
+        # Check if already running
+        if await self.is_server_running():
+            print(f"✅ Assistant-MCP server already running on port {self.port}")
+            return True
+
+        if not self._can_start():
+            return False
 
         try:
             # Start the server process
-            env = os.environ.copy()
-            env["PORT"] = str(self.port)
-
-            self.process = subprocess.Popen(
-                ["npm", "run", "start:api"],
-                cwd=str(self.assistant_mcp_path),
-                env=env,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                preexec_fn=os.setsid if os.name != "nt" else None,
-            )
+            self._spawn_process()
+
+            # Wait for server to be ready, probing once right away and then
+            # backing off
+            delays = self._startup_delays()
+            exited, unwatch = self._watch_process_exit()
+            try:
+                while True:
+                    outcome = self._startup_outcome(await self.is_server_running())
+                    if outcome is not None:
+                        return outcome
+
+                    delay = next(delays, None)
+                    if delay is None:
+                        return self._startup_timed_out()
+
+                    # Sleep until the next probe, waking early if the process exits
+                    try:
+                        await asyncio.wait_for(exited.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                unwatch()
+
+        except Exception as e:
+            print(f"❌ Error starting server: {e}")
+            return False
+
+    def start_server_sync(self) -> bool:
+        """Start the server if not already running, blocking until it is ready"""
+        if self.is_server_running_sync():
+            print(f"✅ Assistant-MCP server already running on port {self.port}")
+            return True
 
-            # Wait for server to be ready
-            max_attempts = 30
-            for attempt in range(max_attempts):
-                await asyncio.sleep(1)
-                if await self.is_server_running():
-                    print(
-                        f"✅ Assistant-MCP server started successfully on port {self.port}"
-                    )
-                    return True
-
-                # Check if process died
-                if self.process.poll() is not None:
-                    stdout, stderr = self.process.communicate()
-                    print(f"❌ Server failed to start:")
-                    if stderr:
-                        print(f"   Error: {stderr.decode()}")
-                    return False
-
-                if attempt % 5 == 0:
-                    print(
-                        f"   Waiting for server to start... ({attempt}/{max_attempts})"
-                    )
-
-            print(f"❌ Server failed to start within {max_attempts} seconds")
-            self.stop_server()
+        if not self._can_start():
             return False
 
+        try:
+            self._spawn_process()
+
+            # Same backoff as start_server, polling the process between probes
+            delays = self._startup_delays()
+            while True:
+                outcome = self._startup_outcome(self.is_server_running_sync())
+                if outcome is not None:
+                    return outcome
+
+                delay = next(delays, None)
+                if delay is None:
+                    return self._startup_timed_out()
+
+                time.sleep(delay)
+
         except Exception as e:
             print(f"❌ Error starting server: {e}")
             return False
 
+    def _watch_process_exit(self) -> Tuple[asyncio.Event, Callable[[], None]]:
+        """
+        Get an event that is set as soon as the server process exits.
+
+        Uses a pidfd registered with the event loop where available (Linux);
+        elsewhere the event never fires and exits are caught by polling.
+        Returns the event and a callback that removes the watch.
+        """
+        exited = asyncio.Event()
+        if not hasattr(os, "pidfd_open"):
+            return exited, lambda: None
+
+        loop = asyncio.get_running_loop()
+        try:
+            pidfd = os.pidfd_open(self.process.pid)
+        except OSError:
+            return exited, lambda: None
+
+        try:
+            loop.add_reader(pidfd, exited.set)
+        except NotImplementedError:
+            # Event loop without fd readers (e.g. Proactor)
+            os.close(pidfd)
+            return exited, lambda: None
+
+        def unwatch() -> None:
+            loop.remove_reader(pidfd)
+            os.close(pidfd)
+
+        return exited, unwatch
+
     def stop_server(self):
         """Stop the assistant-mcp server if we started it"""
         if self.process:
@@ -128,15 +336,35 @@ class AssistantMCPManager:
             finally:
                 self.process = None
 
+        # Keep-alive connections to the stopped server are useless now
+        self._close_sync_client()
+        if self._client is not None:
+            client, self._client = self._client, None
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                # No running loop; the client is released with its connections
+                loop = None
+            if loop is not None and loop is self._client_loop:
+                task = loop.create_task(client.aclose())
+                self._closing.add(task)
+                task.add_done_callback(self._closing.discard)
+
     async def ensure_server_running(self) -> bool:
         """Ensure the server is running, starting it if necessary"""
         if await self.is_server_running():
             return True
         return await self.start_server()
 
+    def ensure_server_running_sync(self) -> bool:
+        """Blocking variant of ensure_server_running for synchronous callers"""
+        if self.is_server_running_sync():
+            return True
+        return self.start_server_sync()
+
     def __enter__(self):
-        """Context manager entry"""
-        asyncio.run(self.ensure_server_running())
+        """Context manager entry (blocking; safe inside a running event loop)"""
+        self.ensure_server_running_sync()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -152,17 +380,21 @@ class AssistantMCPManager:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
         # Note: We don't stop the server here because other processes might be using it
-        pass
+        await self.close()
 
 
 # Singleton instance
 _manager_instance: Optional[AssistantMCPManager] = None
+_manager_lock = threading.Lock()
 
 
 def get_assistant_mcp_manager() -> AssistantMCPManager:
     """Get or create the singleton manager instance"""
     global _manager_instance
+    # Double-checked so the initialized path never takes the lock
     if _manager_instance is None:
-        assistant_path = os.getenv("ASSISTANT_MCP_PATH")
-        _manager_instance = AssistantMCPManager(assistant_path)
+        with _manager_lock:
+            if _manager_instance is None:
+                assistant_path = os.getenv("ASSISTANT_MCP_PATH")
+                _manager_instance = AssistantMCPManager(assistant_path)
     return _manager_instance
@@ -3,24 +3,113 @@
 import asyncio
 import time
 from collections import defaultdict
-from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Optional
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
 
 import structlog
 
+from pm_intelligence.utils._logging import debug_enabled
+
 logger = structlog.get_logger(__name__)
 
+# Re-tune batch size and wait time once per this many successful batches
+ADAPT_INTERVAL = 16
+
 
-@dataclass
 class BatchItem:
     """Individual item in a batch."""
 
-    id: str
+    __slots__ = (
+        "id",
+        "operation",
+        "params",
+        "timestamp",
+        "retry_count",
+        "batch",
+        "index",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        operation: str,
+        params: Dict[str, Any],
+        timestamp: int,
+        retry_count: int = 0,
+    ):
+        self.id = id
+        self.operation = operation
+        self.params = params
+        self.timestamp = timestamp  # time.monotonic_ns() when the item was added
+        self.retry_count = retry_count
+        # Batch currently holding the item and the item's index in it
+        self.batch: Optional["Batch"] = None
+        self.index = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"BatchItem(id={self.id!r}, operation={self.operation!r}, "
+            f"retry_count={self.retry_count})"
+        )
+
+
+@dataclass
+class Batch:
+    """
+    Items for one operation that are processed together.
+
+    The processor resolves the single future with a list of results in item
+    order; each caller picks its own result by index.
+    """
+
     operation: str
-    params: Dict[str, Any]
     future: asyncio.Future
-    timestamp: float
-    retry_count: int = 0
+    wait_time: float
+    items: List[BatchItem] = field(default_factory=list)
+    full: asyncio.Event = field(default_factory=asyncio.Event)
+    # Set once the batch has been handed to its processor (or abandoned)
+    taken: bool = False
+
+    def append(self, item: BatchItem) -> None:
+        """Add item to the batch, recording its result index."""
+        item.batch = self
+        item.index = len(self.items)
+        self.items.append(item)
+
+    def extend(self, items: List[BatchItem]) -> None:
+        """Add several items to the batch, recording their result indexes."""
+        for index, item in enumerate(items, len(self.items)):
+            item.batch = self
+            item.index = index
+        self.items.extend(items)
+
+    def complete(self, results: List[Any]) -> None:
+        """
+        Resolve every item in the batch at once.
+
+        ``results`` must hold one entry per item, in item order. All waiting
+        callers are woken from this single resolution.
+        """
+        if len(results) != len(self.items):
+            raise ValueError(
+                f"Expected {len(self.items)} results for {self.operation}, "
+                f"got {len(results)}"
+            )
+        if not self.future.done():
+            self.future.set_result(results)
+
+
+class OpState:
+    """Adaptive batching parameters for one operation."""
+
+    __slots__ = ("batch_size", "wait_time", "success_rate", "batches")
+
+    def __init__(self, batch_size: int, wait_time: float, success_rate: float = 1.0):
+        self.batch_size = batch_size
+        self.wait_time = wait_time
+        self.success_rate = success_rate
+        # Successful batches since the parameters were last adapted
+        self.batches = 0
 
 
 class BatchProcessor:
@@ -41,17 +130,19 @@ class BatchProcessor:
         self.max_retries = max_retries
         self.adaptive = adaptive
 
-        # Pending items by operation type
-        self.pending: Dict[str, List[BatchItem]] = defaultdict(list)
+        # Batch currently collecting items by operation type
+        self.pending: Dict[str, Batch] = {}
+        self._pending_count = 0
 
         # Batch processors by operation type
         self.processors: Dict[str, Callable] = {}
 
-        # Timers for batch flushing
-        self._timers: Dict[str, asyncio.Task] = {}
+        # Batches waiting to be flushed and their consumer, by operation type
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._consumers: Dict[str, asyncio.Task] = {}
 
-        # Lock for thread safety
-        self._lock = asyncio.Lock()
+        # Flushes started by consumers; referenced until they finish
+        self._flushing: Set[asyncio.Task] = set()
 
         # Statistics
         self._stats = {
@@ -62,17 +153,21 @@ class BatchProcessor:
             "avg_wait_time": 0.0,
         }
 
-        # Adaptive parameters
-        self._adaptive_params = {
-            "batch_sizes": defaultdict(lambda: self.batch_size),
-            "wait_times": defaultdict(lambda: self.wait_time),
-            "success_rates": defaultdict(lambda: 1.0),
-        }
+        # Adaptive parameters by operation type
+        self._op_state: Dict[str, OpState] = defaultdict(
+            lambda: OpState(self.batch_size, self.wait_time)
+        )
 
     def register_processor(
-        self, operation: str, processor: Callable[[List[BatchItem]], Any]
+        self, operation: str, processor: Callable[[Batch], Awaitable[Any]]
     ) -> None:
-        """Register a batch processor for an operation type."""
+        """
+        Register a batch processor for an operation type.
+
+        The processor receives a Batch and must call ``batch.complete()`` with
+        a list of results matching ``batch.items`` (returning the list also
+        works). Raising fails the whole batch and triggers retries.
+        """
         self.processors[operation] = processor
         logger.debug("Registered batch processor", operation=operation)
 
@@ -88,53 +183,192 @@ class BatchProcessor:
             raise ValueError(f"No processor registered for operation: {operation}")
 
         # Create batch item
-        future = asyncio.Future()
+        now_ns = time.monotonic_ns()
         item = BatchItem(
-            id=item_id or f"{operation}_{time.time()}",
+            id=item_id or f"{operation}_{now_ns}",
             operation=operation,
             params=params,
-            future=future,
-            timestamp=time.time(),
+            timestamp=now_ns,
         )
 
-        async with self._lock:
-            self.pending[operation].append(item)
-            self._stats["total_items"] += 1
+        # No await between lookup and append, so no lock is needed
+        batch = self._pending_batch(operation)
+        batch.append(item)
+        self._pending_count += 1
+        self._stats["total_items"] += 1
 
-            # Start timer if not already running
-            if operation not in self._timers:
-                wait_time = self._get_wait_time(operation)
-                self._timers[operation] = asyncio.create_task(
-                    self._flush_after_delay(operation, wait_time)
-                )
-
-            # Check if we should flush immediately
-            batch_size = self._get_batch_size(operation)
-            if len(self.pending[operation]) >= batch_size:
-                asyncio.create_task(self._flush_batch(operation))
+        if len(batch.items) >= self._get_batch_size(operation):
+            self._close_batch(batch)
 
         # Wait for result
-        return await future
+        return await self._wait_for_result(item)
 
-    async def _flush_after_delay(self, operation: str, wait_time: float) -> None:
-        """Flush batch after wait time expires."""
-        await asyncio.sleep(wait_time)
-        await self._flush_batch(operation)
+    def _pending_batch(
+        self, operation: str, wait_time: Optional[float] = None
+    ) -> Batch:
+        """
+        Get the batch currently collecting items for an operation.
 
-    async def _flush_batch(self, operation: str) -> None:
-        """Flush all pending items for an operation."""
-        async with self._lock:
-            if operation not in self.pending:
-                return
+        A new batch is handed to the operation's consumer, which flushes it
+        after ``wait_time`` or as soon as it fills up.
+        """
+        batch = self.pending.get(operation)
+        if batch is None:
+            batch = Batch(
+                operation=operation,
+                future=asyncio.get_running_loop().create_future(),
+                wait_time=(
+                    wait_time if wait_time is not None
+                    else self._get_wait_time(operation)
+                ),
+            )
+            self.pending[operation] = batch
+            self._get_queue(operation).put_nowait(batch)
+        return batch
 
-            # Get items to process
-            items = self.pending.pop(operation, [])
+    def _close_batch(self, batch: Batch) -> None:
+        """
+        Stop a full batch from collecting items and wake its consumer.
 
-            # Cancel timer
-            if operation in self._timers:
-                self._timers[operation].cancel()
-                del self._timers[operation]
+        The next item for the operation opens a new batch, so no batch grows
+        past the batch size while it waits to be flushed.
+        """
+        if self.pending.get(batch.operation) is batch:
+            del self.pending[batch.operation]
+        batch.full.set()
 
+    def _extend_batches(
+        self, operation: str, items: List[BatchItem], wait_time: float
+    ) -> None:
+        """Add items to the pending batch, opening new ones as batches fill."""
+        batch_size = self._get_batch_size(operation)
+        while items:
+            batch = self._pending_batch(operation, wait_time)
+            room = batch_size - len(batch.items)
+            if room > 0:
+                batch.extend(items[:room])
+                items = items[room:]
+            if len(batch.items) >= batch_size:
+                self._close_batch(batch)
+
+    def _get_queue(self, operation: str) -> asyncio.Queue:
+        """Get the batch queue for an operation, starting its consumer."""
+        queue = self._queues.get(operation)
+        if queue is None:
+            queue = self._queues[operation] = asyncio.Queue()
+        if operation not in self._consumers:
+            self._consumers[operation] = asyncio.create_task(
+                self._consume(operation, queue)
+            )
+        return queue
+
+    async def _wait_for_result(self, item: BatchItem) -> Any:
+        """Wait for the batch holding the item and return the item's result."""
+        while True:
+            batch = item.batch
+            try:
+                # Shield so a cancelled caller does not cancel the whole batch
+                results = await asyncio.shield(batch.future)
+            except Exception:
+                if item.batch is not batch:
+                    # Item was re-queued into a new batch for retry
+                    continue
+                raise
+            return results[item.index]
+
+    async def _consume(self, operation: str, queue: asyncio.Queue) -> None:
+        """Flush batches for an operation in the order they were opened."""
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                batch = await queue.get()
+                if batch is None:
+                    # Shutdown sentinel; keep draining anything queued behind it
+                    if queue.empty():
+                        return
+                    continue
+
+                if batch.taken:
+                    # Already taken by flush_all()
+                    continue
+
+                try:
+                    if not batch.full.is_set():
+                        # Timer handle instead of wait_for: no extra task per batch
+                        deadline = loop.call_later(batch.wait_time, batch.full.set)
+                        try:
+                            await batch.full.wait()
+                        finally:
+                            deadline.cancel()
+                except BaseException as e:
+                    # Cancelled while waiting: fail the batch so its callers
+                    # don't wait forever, then stop
+                    self._abandon_batch(batch, e)
+                    raise
+
+                # Process in a separate task so the next batch's timer keeps
+                # running and full batches don't queue behind a slow processor
+                self._start_flush(batch)
+        except BaseException as e:
+            # Nothing else flushes this operation's batches; fail the ones
+            # left behind instead of leaving their callers waiting forever
+            self._abandon_queued(operation, queue, e)
+            raise
+        finally:
+            # Unregister so the next batch for this operation starts a consumer
+            del self._consumers[operation]
+
+    def _abandon_queued(
+        self, operation: str, queue: asyncio.Queue, error: BaseException
+    ) -> None:
+        """Fail every queued and pending batch of a stopped consumer."""
+        while not queue.empty():
+            batch = queue.get_nowait()
+            if batch is not None:
+                self._abandon_batch(batch, error)
+
+        batch = self.pending.get(operation)
+        if batch is not None:
+            self._abandon_batch(batch, error)
+
+    def _start_flush(self, batch: Batch) -> None:
+        """Flush a batch in the background, keeping a reference to the task."""
+        task = asyncio.create_task(self._run_flush(batch))
+        self._flushing.add(task)
+        task.add_done_callback(self._flushing.discard)
+
+    async def _run_flush(self, batch: Batch) -> None:
+        """Flush a batch, failing it if the processor raises past Exception."""
+        try:
+            await self._flush_batch(batch)
+        except BaseException as e:
+            self._abandon_batch(batch, e)
+            raise
+
+    def _abandon_batch(self, batch: Batch, error: BaseException) -> None:
+        """Detach a batch that won't be processed and fail its callers."""
+        if not batch.taken:
+            batch.taken = True
+            if self.pending.get(batch.operation) is batch:
+                del self.pending[batch.operation]
+            self._pending_count -= len(batch.items)
+        if not batch.future.done():
+            failure = RuntimeError(f"Batch processing for {batch.operation} stopped")
+            failure.__cause__ = error
+            batch.future.set_exception(failure)
+
+    async def _flush_batch(self, batch: Batch) -> None:
+        """Process a batch unless it has already been taken for flushing."""
+        if batch.taken:
+            return
+
+        # Detach the batch so new items start the next one
+        batch.taken = True
+        self._close_batch(batch)
+        operation = batch.operation
+
+        items = batch.items
+        self._pending_count -= len(items)
         if not items:
             return
 
@@ -150,15 +384,22 @@ class BatchProcessor:
 
         # Execute processor
         processor = self.processors[operation]
-        start_time = time.time()
+        start_ns = time.monotonic_ns()
 
         try:
-            await processor(items)
+            results = await processor(batch)
+            if not batch.future.done():
+                batch.complete(results)
 
             # Update success rate if adaptive
             if self.adaptive:
                 self._update_success_rate(operation, 1.0)
-                self._adapt_parameters(operation, len(items), time.time() - start_time)
+                state = self._op_state[operation]
+                state.batches += 1
+                if state.batches >= ADAPT_INTERVAL:
+                    state.batches = 0
+                    elapsed = (time.monotonic_ns() - start_ns) / 1e9
+                    self._adapt_parameters(operation, len(items), elapsed)
 
         except Exception as e:
             logger.error(
@@ -175,70 +416,66 @@ class BatchProcessor:
             if self.adaptive:
                 self._update_success_rate(operation, 0.0)
 
-            # Handle retries
-            await self._handle_failed_batch(items, e)
+            # Handle retries, then fail the items that were not re-queued
+            self._handle_failed_batch(items, e)
+            if not batch.future.done():
+                batch.future.set_exception(e)
 
-    async def _handle_failed_batch(
+    def _handle_failed_batch(
         self, items: List[BatchItem], error: Exception
     ) -> None:
-        """Handle failed batch items."""
-        retry_items = []
+        """
+        Handle failed batch items.
+
+        Items under the retry limit are moved to a new batch; the rest stay
+        on the failed batch and receive its error.
+        """
+        retry_items: Dict[str, List[BatchItem]] = defaultdict(list)
+        max_retry: Dict[str, int] = defaultdict(int)
 
         for item in items:
             if item.retry_count < self.max_retries:
                 # Retry item
                 item.retry_count += 1
-                retry_items.append(item)
-            else:
-                # Max retries exceeded
-                item.future.set_exception(error)
-
-        # Re-queue retry items
-        if retry_items:
-            async with self._lock:
-                for item in retry_items:
-                    self.pending[item.operation].append(item)
-
-            # Schedule retry with exponential backoff
-            for operation in set(item.operation for item in retry_items):
-                wait_time = self._get_wait_time(operation) * (
-                    2 ** retry_items[0].retry_count
-                )
-
-                if operation not in self._timers:
-                    self._timers[operation] = asyncio.create_task(
-                        self._flush_after_delay(operation, wait_time)
-                    )
+                retry_items[item.operation].append(item)
+                if item.retry_count > max_retry[item.operation]:
+                    max_retry[item.operation] = item.retry_count
+
+        # Re-queue retry items; a newly opened batch waits with exponential
+        # backoff, while an already collecting batch keeps its own deadline
+        for operation, op_items in retry_items.items():
+            wait_time = self._get_wait_time(operation) * (2 ** max_retry[operation])
+            self._pending_count += len(op_items)
+            self._extend_batches(operation, op_items, wait_time)
 
     def _get_batch_size(self, operation: str) -> int:
         """Get adaptive batch size for operation."""
         if self.adaptive:
-            return int(self._adaptive_params["batch_sizes"][operation])
+            return self._op_state[operation].batch_size
         return self.batch_size
 
     def _get_wait_time(self, operation: str) -> float:
         """Get adaptive wait time for operation."""
         if self.adaptive:
-            return self._adaptive_params["wait_times"][operation]
+            return self._op_state[operation].wait_time
         return self.wait_time
 
     def _update_success_rate(self, operation: str, success: float) -> None:
         """Update success rate for operation."""
-        current_rate = self._adaptive_params["success_rates"][operation]
+        state = self._op_state[operation]
         # Exponential moving average
         alpha = 0.1
-        self._adaptive_params["success_rates"][operation] = (
-            alpha * success + (1 - alpha) * current_rate
-        )
+        state.success_rate = alpha * success + (1 - alpha) * state.success_rate
 
     def _adapt_parameters(
         self, operation: str, batch_size: int, processing_time: float
     ) -> None:
         """Adapt batch size and wait time based on performance."""
-        success_rate = self._adaptive_params["success_rates"][operation]
+        state = self._op_state[operation]
+        success_rate = state.success_rate
 
         # Adapt batch size
-        current_batch_size = self._adaptive_params["batch_sizes"][operation]
+        current_batch_size = state.batch_size
 
         if success_rate > 0.95:
             # High success rate - increase batch size
@@ -249,7 +486,7 @@ class BatchProcessor:
         else:
             new_batch_size = current_batch_size
 
-        self._adaptive_params["batch_sizes"][operation] = int(new_batch_size)
+        state.batch_size = int(new_batch_size)
 
         # Adapt wait time based on processing time
         items_per_second = (
@@ -265,8 +502,10 @@ class BatchProcessor:
         else:
             new_wait_time = self.wait_time
 
-        self._adaptive_params["wait_times"][operation] = new_wait_time
+        state.wait_time = new_wait_time
 
+        if not debug_enabled(logger):
+            return
         logger.debug(
             "Adapted batch parameters",
             operation=operation,
@@ -277,35 +516,41 @@ class BatchProcessor:
 
     async def flush_all(self) -> None:
         """Flush all pending batches."""
-        operations = list(self.pending.keys())
-
-        for operation in operations:
-            await self._flush_batch(operation)
+        # Operations are independent, so their processors can run side by side
+        batches = list(self.pending.values())
+        await asyncio.gather(
+            *(self._run_flush(batch) for batch in batches),
+            *self._flushing,
+            return_exceptions=True,
+        )
 
     def get_stats(self) -> Dict[str, Any]:
         """Get batch processor statistics."""
         return {
             **self._stats,
-            "pending_items": sum(len(items) for items in self.pending.values()),
-            "active_timers": len(self._timers),
+            "pending_items": self._pending_count,
+            "active_consumers": len(self._consumers),
             "adaptive_params": {
                 operation: {
-                    "batch_size": int(self._adaptive_params["batch_sizes"][operation]),
-                    "wait_time": self._adaptive_params["wait_times"][operation],
-                    "success_rate": self._adaptive_params["success_rates"][operation],
+                    "batch_size": state.batch_size,
+                    "wait_time": state.wait_time,
+                    "success_rate": state.success_rate,
                 }
-                for operation in self._adaptive_params["batch_sizes"].keys()
+                for operation, state in self._op_state.items()
             },
         }
 
     async def shutdown(self) -> None:
         """Shutdown batch processor gracefully."""
-        # Cancel all timers
-        for timer in self._timers.values():
-            timer.cancel()
-        self._timers.clear()
-
         # Flush all pending batches
         await self.flush_all()
 
+        # Let consumers and in-flight flushes finish, including any retries
+        # they queue, then stop
+        while self._consumers or self._flushing:
+            tasks = [*self._consumers.values(), *self._flushing]
+            for operation in self._consumers:
+                self._queues[operation].put_nowait(None)
+            await asyncio.gather(*tasks, return_exceptions=True)
+
         logger.info("Batch processor shutdown", stats=self.get_stats())
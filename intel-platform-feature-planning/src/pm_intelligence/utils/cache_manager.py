@@ -3,23 +3,69 @@
 import asyncio
 import json
 import time
-from typing import Any, Dict, Optional, Union
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
 
 import aiosqlite
 import structlog
-from cachetools import LRUCache, TTLCache
+from cachetools import TTLCache
 
 logger = structlog.get_logger(__name__)
 
+# Prefer orjson for cache payloads; it emits bytes that Redis and SQLite
+# store directly. Both decoders accept str and bytes, so entries written by
+# either encoder stay readable.
+try:
+    import orjson
+
+    def _dumps(value: Any) -> bytes:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+    _loads = orjson.loads
+except ImportError:
+    _dumps = json.dumps
+    _loads = json.loads
+
+
+# Indexes into CacheStats.counters
+HITS, MISSES, EVICTIONS, PROMOTIONS, ERRORS = 0, 1, 2, 3, 4
+
 
 class CacheStats:
     """Track cache statistics."""
 
+    __slots__ = ("counters",)
+
     def __init__(self):
-        self.hits = 0
-        self.misses = 0
-        self.evictions = 0
-        self.promotions = 0
+        # One flat int64 array; hot paths bump counters[HITS] etc. directly
+        self.counters = array("q", [0, 0, 0, 0, 0])
+
+    @property
+    def hits(self) -> int:
+        """Number of cache hits."""
+        return self.counters[HITS]
+
+    @property
+    def misses(self) -> int:
+        """Number of cache misses."""
+        return self.counters[MISSES]
+
+    @property
+    def evictions(self) -> int:
+        """Number of evicted entries."""
+        return self.counters[EVICTIONS]
+
+    @property
+    def promotions(self) -> int:
+        """Number of values promoted into this level."""
+        return self.counters[PROMOTIONS]
+
+    @property
+    def errors(self) -> int:
+        """Number of backend errors swallowed by this level."""
+        return self.counters[ERRORS]
 
     @property
     def hit_rate(self) -> float:
@@ -29,46 +75,188 @@ class CacheStats:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
+        hits, misses, evictions, promotions, errors = self.counters
+        total = hits + misses
         return {
-            "hits": self.hits,
-            "misses": self.misses,
-            "evictions": self.evictions,
-            "promotions": self.promotions,
-            "hit_rate": self.hit_rate,
+            "hits": hits,
+            "misses": misses,
+            "evictions": evictions,
+            "promotions": promotions,
+            "errors": errors,
+            "hit_rate": hits / total if total > 0 else 0.0,
         }
 
 
+# Sentinel for lookups where None is a valid cached value
+_MISSING = object()
+
+
+class FrequencyCounter:
+    """
+    Recent access frequency per key for TinyLFU admission.
+
+    Counts live in a plain dict so the per-access update is a C-level
+    dict operation. After a sample period every count is halved and keys
+    that drop to zero are forgotten, so old popularity fades and memory
+    stays proportional to the cache size.
+    """
+
+    __slots__ = ("_counts", "_additions", "_sample_size")
+
+    def __init__(self, capacity: int):
+        self._counts: Dict[Any, int] = {}
+        self._additions = 0
+        self._sample_size = 10 * max(capacity, 16)
+
+    def increment(self, key: Any) -> None:
+        """Record one access to key."""
+        counts = self._counts
+        counts[key] = counts.get(key, 0) + 1
+
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._counts = {k: n >> 1 for k, n in counts.items() if n > 1}
+            self._additions //= 2
+
+    def frequency(self, key: Any) -> int:
+        """How often key was accessed recently."""
+        return self._counts.get(key, 0)
+
+
+class TinyLFUCache:
+    """
+    Bounded mapping with W-TinyLFU eviction.
+
+    New keys land in a small LRU window. Keys leaving the window only
+    enter the main LRU region if they were used more often than the main
+    region's eviction victim, so one-off scans
+    cannot flush the hot set.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._window_size = max(1, maxsize // 100)
+        self._main_size = max(0, maxsize - self._window_size)
+        self._window: OrderedDict = OrderedDict()
+        self._main: OrderedDict = OrderedDict()
+        self._frequency = FrequencyCounter(maxsize)
+
+    def __len__(self) -> int:
+        return len(self._window) + len(self._main)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._main or key in self._window
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """Get value for key, recording the access."""
+        self._frequency.increment(key)
+        main = self._main
+        value = main.get(key, _MISSING)
+        if value is not _MISSING:
+            main.move_to_end(key)
+            return value
+
+        window = self._window
+        value = window.get(key, _MISSING)
+        if value is not _MISSING:
+            window.move_to_end(key)
+            return value
+        return default
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self._frequency.increment(key)
+        main = self._main
+        if key in main:
+            main[key] = value
+            main.move_to_end(key)
+            return
+
+        window = self._window
+        if key in window:
+            window[key] = value
+            window.move_to_end(key)
+            return
+
+        window[key] = value
+        if len(window) > self._window_size:
+            self._admit(*window.popitem(last=False))
+
+    def _admit(self, key: Any, value: Any) -> None:
+        """Move a key evicted from the window into the main region."""
+        if len(self._main) < self._main_size:
+            self._main[key] = value
+            return
+        if not self._main:
+            return
+
+        # Keep whichever of candidate and victim is used more often
+        victim = next(iter(self._main))
+        if self._frequency.frequency(key) > self._frequency.frequency(victim):
+            del self._main[victim]
+            self._main[key] = value
+
+    def pop(self, key: Any, default: Any = None) -> Any:
+        """Remove key and return its value."""
+        if key in self._main:
+            return self._main.pop(key)
+        return self._window.pop(key, default)
+
+    def clear(self) -> None:
+        """Remove all entries (access history is kept)."""
+        self._window.clear()
+        self._main.clear()
+
+
 class L1Cache:
-    """In-memory LRU cache (fastest)."""
+    """In-memory W-TinyLFU cache (fastest)."""
+
+    __slots__ = ("cache", "stats", "_counters")
 
     def __init__(self, maxsize: int = 1000):
-        self.cache = LRUCache(maxsize=maxsize)
+        self.cache = TinyLFUCache(maxsize=maxsize)
         self.stats = CacheStats()
+        self._counters = self.stats.counters
 
-    async def get(self, key: str) -> Optional[Any]:
-        """Get value from cache."""
+    def get_sync(self, key: str) -> Optional[Any]:
+        """Get value from cache without a coroutine round trip."""
         value = self.cache.get(key)
         if value is not None:
-            self.stats.hits += 1
+            self._counters[HITS] += 1
         else:
-            self.stats.misses += 1
+            self._counters[MISSES] += 1
         return value
 
-    async def set(self, key: str, value: Any) -> None:
-        """Set value in cache."""
+    def set_sync(self, key: str, value: Any) -> None:
+        """Set value in cache without a coroutine round trip."""
         # Check if we're evicting
         if len(self.cache) >= self.cache.maxsize and key not in self.cache:
-            self.stats.evictions += 1
+            self._counters[EVICTIONS] += 1
 
         self.cache[key] = value
 
+    def delete_sync(self, key: str) -> None:
+        """Delete value from cache without a coroutine round trip."""
+        self.cache.pop(key, None)
+
+    def clear_sync(self) -> None:
+        """Clear all cache entries without a coroutine round trip."""
+        self.cache.clear()
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Get value from cache."""
+        return self.get_sync(key)
+
+    async def set(self, key: str, value: Any) -> None:
+        """Set value in cache."""
+        self.set_sync(key, value)
+
     async def delete(self, key: str) -> None:
         """Delete value from cache."""
-        self.cache.pop(key, None)
+        self.delete_sync(key)
 
     async def clear(self) -> None:
         """Clear all cache entries."""
-        self.cache.clear()
+        self.clear_sync()
 
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
@@ -82,9 +270,39 @@ class L1Cache:
 class L2Cache:
     """Redis cache (if available) - for distributed caching."""
 
-    def __init__(self, redis_url: Optional[str] = None, ttl: int = 3600):
+    # Keys fetched per SCAN call and unlinked per UNLINK command in clear()
+    SCAN_COUNT = 1000
+    UNLINK_BATCH = 500
+
+    # Namespace for our keys; kept as bytes so redis-py sends them unencoded
+    _PREFIX = b"pm_intel:"
+
+    # Redis errors are counted in stats; only every Nth one is logged
+    ERROR_LOG_EVERY = 100
+
+    # Seconds a caller waits for a free pooled connection before erroring
+    POOL_TIMEOUT = 5.0
+
+    __slots__ = (
+        "redis_url",
+        "ttl",
+        "max_connections",
+        "stats",
+        "enabled",
+        "redis",
+        "_client",
+    )
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        ttl: int = 3600,
+        max_connections: int = 20,
+    ):
         self.redis_url = redis_url
         self.ttl = ttl
+        # Size of the connection pool shared by concurrent callers
+        self.max_connections = max_connections
         self.stats = CacheStats()
         self.enabled = False
 
@@ -106,10 +324,27 @@ class L2Cache:
             return None
 
         if self._client is None:
-            self._client = await self.redis.from_url(self.redis_url)
+            # Blocking pool: callers beyond max_connections wait for a free
+            # connection instead of failing with MaxConnectionsError
+            pool = self.redis.BlockingConnectionPool.from_url(
+                self.redis_url,
+                max_connections=self.max_connections,
+                timeout=self.POOL_TIMEOUT,
+            )
+            self._client = self.redis.Redis(connection_pool=pool)
 
         return self._client
 
+    def _record_error(self, operation: str, error: Exception) -> None:
+        """Count a Redis error, logging the first and then every Nth one."""
+        counters = self.stats.counters
+        counters[ERRORS] += 1
+        errors = counters[ERRORS]
+        if errors == 1 or errors % self.ERROR_LOG_EVERY == 0:
+            logger.error(
+                "Redis error", operation=operation, error=str(error), errors=errors
+            )
+
     async def get(self, key: str) -> Optional[Any]:
         """Get value from cache."""
         client = await self._get_client()
@@ -117,17 +352,43 @@ class L2Cache:
             return None
 
         try:
-            value = await client.get(f"pm_intel:{key}")
+            value = await client.get(self._PREFIX + key.encode())
             if value:
-                self.stats.hits += 1
-                return json.loads(value)
+                self.stats.counters[HITS] += 1
+                return _loads(value)
             else:
-                self.stats.misses += 1
+                self.stats.counters[MISSES] += 1
                 return None
         except Exception as e:
-            logger.error("Redis get error", key=key, error=str(e))
+            self._record_error("get", e)
             return None
 
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get several values with a single MGET; missing keys are omitted."""
+        client = await self._get_client()
+        if not client or not keys:
+            return {}
+
+        try:
+            prefix = self._PREFIX
+            values = await client.mget([prefix + key.encode() for key in keys])
+        except Exception as e:
+            self._record_error("get_many", e)
+            return {}
+
+        found: Dict[str, Any] = {}
+        for key, value in zip(keys, values):
+            if value:
+                try:
+                    found[key] = _loads(value)
+                except Exception as e:
+                    # An undecodable entry is a miss; keep the other keys
+                    self._record_error("get_many", e)
+
+        self.stats.counters[HITS] += len(found)
+        self.stats.counters[MISSES] += len(keys) - len(found)
+        return found
+
     async def set(self, key: str, value: Any) -> None:
         """Set value in cache."""
         client = await self._get_client()
@@ -135,9 +396,24 @@ class L2Cache:
             return
 
         try:
-            await client.setex(f"pm_intel:{key}", self.ttl, json.dumps(value))
+            await client.setex(self._PREFIX + key.encode(), self.ttl, _dumps(value))
         except Exception as e:
-            logger.error("Redis set error", key=key, error=str(e))
+            self._record_error("set", e)
+
+    async def set_many(self, items: Dict[str, Any]) -> None:
+        """Set several values in one pipelined round trip."""
+        client = await self._get_client()
+        if not client:
+            return
+
+        try:
+            prefix = self._PREFIX
+            async with client.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    pipe.setex(prefix + key.encode(), self.ttl, _dumps(value))
+                await pipe.execute()
+        except Exception as e:
+            self._record_error("set_many", e)
 
     async def delete(self, key: str) -> None:
         """Delete value from cache."""
@@ -146,9 +422,21 @@ class L2Cache:
             return
 
         try:
-            await client.delete(f"pm_intel:{key}")
+            await client.delete(self._PREFIX + key.encode())
+        except Exception as e:
+            self._record_error("delete", e)
+
+    async def delete_many(self, keys: List[str]) -> None:
+        """Delete several values with a single DEL."""
+        client = await self._get_client()
+        if not client or not keys:
+            return
+
+        try:
+            prefix = self._PREFIX
+            await client.delete(*(prefix + key.encode() for key in keys))
         except Exception as e:
-            logger.error("Redis delete error", key=key, error=str(e))
+            self._record_error("delete_many", e)
 
     async def clear(self) -> None:
         """Clear all cache entries."""
@@ -157,16 +445,29 @@ class L2Cache:
             return
 
         try:
-            # Clear all pm_intel keys
-            async for key in client.scan_iter(match="pm_intel:*"):
-                await client.delete(key)
+            # Clear all pm_intel keys, unlinking them in pipelined chunks so
+            # the server frees memory in the background
+            async with client.pipeline(transaction=False) as pipe:
+                batch = []
+                async for key in client.scan_iter(
+                    match=self._PREFIX + b"*", count=self.SCAN_COUNT
+                ):
+                    batch.append(key)
+                    if len(batch) >= self.UNLINK_BATCH:
+                        pipe.unlink(*batch)
+                        batch = []
+                if batch:
+                    pipe.unlink(*batch)
+                await pipe.execute()
         except Exception as e:
-            logger.error("Redis clear error", error=str(e))
+            self._record_error("clear", e)
 
     async def close(self) -> None:
         """Close Redis connection."""
         if self._client:
             await self._client.close()
+            # The pool was passed in explicitly, so the client leaves it open
+            await self._client.connection_pool.disconnect()
             self._client = None
 
     def get_stats(self) -> Dict[str, Any]:
@@ -177,26 +478,102 @@ class L2Cache:
 class L3Cache:
     """SQLite cache (persistent)."""
 
+    # WAL lets readers proceed during writes; NORMAL syncs only at checkpoints
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA mmap_size=268435456",
+        "PRAGMA cache_size=-65536",
+        "PRAGMA journal_size_limit=6144000",
+    )
+
+    # Per-connection settings for the read-only connections
+    READER_PRAGMAS = (
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA mmap_size=268435456",
+        "PRAGMA cache_size=-65536",
+    )
+
+    # Seconds between background purges of expired rows
+    CLEANUP_INTERVAL = 60
+
+    # Seconds between refreshes of the clock used for expiry checks
+    CLOCK_RESOLUTION = 0.5
+
+    # Read-only connections serving get(); WAL lets them run beside the writer
+    READER_COUNT = 2
+
+    # Keys per IN (...) lookup, below SQLite's bound-variable limit
+    GET_MANY_CHUNK = 500
+
+    # Hot statements, kept as constants so each connection's statement
+    # cache reuses the compiled form
+    _SQL_CREATE = """
+        CREATE TABLE IF NOT EXISTS cache (
+            key TEXT PRIMARY KEY,
+            value BLOB NOT NULL,
+            expires_at INTEGER,
+            created_at INTEGER NOT NULL
+        )
+    """
+    _SQL_GET = """
+        SELECT value FROM cache
+        WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)
+    """
+    _SQL_GET_MANY = """
+        SELECT key, value FROM cache
+        WHERE key IN ({placeholders})
+        AND (expires_at IS NULL OR expires_at > ?)
+    """
+    _SQL_SET = """
+        INSERT OR REPLACE INTO cache (key, value, expires_at, created_at)
+        VALUES (?, ?, ?, ?)
+    """
+    _SQL_DEL = "DELETE FROM cache WHERE key = ?"
+    _SQL_CLEAN = """
+        DELETE FROM cache
+        WHERE expires_at IS NOT NULL AND expires_at <= ?
+    """
+
+    __slots__ = (
+        "db_path",
+        "stats",
+        "_db",
+        "_write_lock",
+        "_readers",
+        "_reader_pool",
+        "_background",
+        "_now",
+    )
+
     def __init__(self, db_path: str = "./data/cache.db"):
         self.db_path = db_path
         self.stats = CacheStats()
         self._db: Optional[aiosqlite.Connection] = None
+        # One writer connection: bulk transactions hold this from BEGIN to
+        # COMMIT so other writes can't land inside (or be rolled back with) them
+        self._write_lock = asyncio.Lock()
+        self._readers: List[aiosqlite.Connection] = []
+        self._reader_pool: Optional[asyncio.Queue] = None
+        self._background: List[asyncio.Task] = []
+
+        # Coarse wall clock in whole seconds, refreshed by _tick()
+        self._now = int(time.time())
 
     async def initialize(self) -> None:
         """Initialize database."""
-        self._db = await aiosqlite.connect(self.db_path)
+        # Autocommit: single statements commit on their own, bulk writes
+        # open explicit transactions
+        self._db = await aiosqlite.connect(self.db_path, isolation_level=None)
 
-        # Create cache table
-        await self._db.execute(
-            """
-            CREATE TABLE IF NOT EXISTS cache (
-                key TEXT PRIMARY KEY,
-                value TEXT NOT NULL,
-                expires_at INTEGER,
-                created_at INTEGER NOT NULL
-            )
-        """
-        )
+        for pragma in self.PRAGMAS:
+            await self._db.execute(pragma)
+
+        await self._migrate_value_column()
+
+        # Create cache table (values are serialized bytes)
+        await self._db.execute(self._SQL_CREATE)
 
         await self._db.execute(
             """
@@ -205,10 +582,69 @@ class L3Cache:
         """
         )
 
-        await self._db.commit()
+        await self._open_readers()
+
+        # Reads already skip expired rows; purge them off the read path
+        self._background = [
+            asyncio.create_task(self._tick()),
+            asyncio.create_task(self._cleanup_loop()),
+        ]
+
+    async def _open_readers(self) -> None:
+        """Open the read-only connection pool used by get()."""
+        if self.db_path == ":memory:" or self.db_path.startswith("file:"):
+            # Private or caller-managed databases; reads go through the writer
+            return
+
+        uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        self._reader_pool = asyncio.Queue()
+        for _ in range(self.READER_COUNT):
+            reader = await aiosqlite.connect(uri, uri=True)
+            for pragma in self.READER_PRAGMAS:
+                await reader.execute(pragma)
+            self._readers.append(reader)
+            self._reader_pool.put_nowait(reader)
+
+    async def _migrate_value_column(self) -> None:
+        """Rebuild a cache table created with a TEXT value column as BLOB."""
+        cursor = await self._db.execute("PRAGMA table_info(cache)")
+        columns = {row[1]: row[2] for row in await cursor.fetchall()}
+        if columns.get("value", "").upper() != "TEXT":
+            return
+
+        async with self._write_lock:
+            await self._db.execute("BEGIN")
+            try:
+                await self._db.execute("ALTER TABLE cache RENAME TO cache_text")
+                await self._db.execute(self._SQL_CREATE)
+                await self._db.execute(
+                    """
+                    INSERT INTO cache (key, value, expires_at, created_at)
+                    SELECT key, CAST(value AS BLOB), expires_at, created_at
+                    FROM cache_text
+                """
+                )
+                # Drops the old idx_expires_at with it; initialize recreates it
+                await self._db.execute("DROP TABLE cache_text")
+            except BaseException:
+                await self._db.rollback()
+                raise
+
+            await self._db.commit()
+        logger.info("Migrated SQLite cache value column to BLOB", path=self.db_path)
 
     async def close(self) -> None:
         """Close database connection."""
+        for task in self._background:
+            task.cancel()
+        await asyncio.gather(*self._background, return_exceptions=True)
+        self._background = []
+
+        for reader in self._readers:
+            await reader.close()
+        self._readers = []
+        self._reader_pool = None
+
         if self._db:
             await self._db.close()
             self._db = None
@@ -218,82 +654,192 @@ class L3Cache:
         if not self._db:
             await self.initialize()
 
-        # Clean expired entries
-        await self._cleanup_expired()
-
-        cursor = await self._db.execute(
-            """
-            SELECT value FROM cache 
-            WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)
-        """,
-            (key, int(time.time())),
-        )
-
-        row = await cursor.fetchone()
+        rows = await self._read(self._SQL_GET, (key, self._now))
+        row = rows[0] if rows else None
 
         if row:
-            self.stats.hits += 1
-            return json.loads(row[0])
+            self.stats.counters[HITS] += 1
+            return _loads(row[0])
         else:
-            self.stats.misses += 1
+            self.stats.counters[MISSES] += 1
             return None
 
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get several values with IN (...) lookups; missing keys are omitted."""
+        if not self._db:
+            await self.initialize()
+
+        now = self._now
+        found: Dict[str, Any] = {}
+        for start in range(0, len(keys), self.GET_MANY_CHUNK):
+            chunk = keys[start : start + self.GET_MANY_CHUNK]
+            sql = self._SQL_GET_MANY.format(placeholders=",".join("?" * len(chunk)))
+            for key, value in await self._read(sql, (*chunk, now)):
+                found[key] = _loads(value)
+
+        self.stats.counters[HITS] += len(found)
+        self.stats.counters[MISSES] += len(keys) - len(found)
+        return found
+
+    async def _read(self, sql: str, params: tuple) -> List[tuple]:
+        """Run a query on a pooled reader (or the writer) and fetch all rows."""
+        if self._reader_pool is None:
+            cursor = await self._db.execute(sql, params)
+            return await cursor.fetchall()
+
+        reader = await self._reader_pool.get()
+        try:
+            cursor = await reader.execute(sql, params)
+            return await cursor.fetchall()
+        finally:
+            self._reader_pool.put_nowait(reader)
+
     async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
         """Set value in cache."""
         if not self._db:
             await self.initialize()
 
-        expires_at = int(time.time() + ttl) if ttl else None
+        now = self._now
+        expires_at = now + ttl if ttl else None
 
-        await self._db.execute(
-            """
-            INSERT OR REPLACE INTO cache (key, value, expires_at, created_at)
-            VALUES (?, ?, ?, ?)
-        """,
-            (key, json.dumps(value), expires_at, int(time.time())),
-        )
+        async with self._write_lock:
+            await self._db.execute(self._SQL_SET, (key, _dumps(value), expires_at, now))
 
-        await self._db.commit()
+    async def set_many(self, items: Dict[str, Any], ttl: Optional[int] = None) -> None:
+        """Set several values in a single transaction."""
+        if not self._db:
+            await self.initialize()
+
+        now = self._now
+        expires_at = now + ttl if ttl else None
+
+        await self._executemany_in_transaction(
+            self._SQL_SET,
+            [(key, _dumps(value), expires_at, now) for key, value in items.items()],
+        )
 
     async def delete(self, key: str) -> None:
         """Delete value from cache."""
         if not self._db:
             await self.initialize()
 
-        await self._db.execute("DELETE FROM cache WHERE key = ?", (key,))
-        await self._db.commit()
+        async with self._write_lock:
+            await self._db.execute(self._SQL_DEL, (key,))
+
+    async def delete_many(self, keys: List[str]) -> None:
+        """Delete several values in a single transaction."""
+        if not self._db:
+            await self.initialize()
+
+        await self._executemany_in_transaction(
+            self._SQL_DEL, [(key,) for key in keys]
+        )
+
+    async def _executemany_in_transaction(self, sql: str, rows: List[tuple]) -> None:
+        """Run a statement for every row with one commit for the whole batch."""
+        async with self._write_lock:
+            await self._db.execute("BEGIN")
+            try:
+                await self._db.executemany(sql, rows)
+            except BaseException:
+                await self._db.rollback()
+                raise
+
+            await self._db.commit()
 
     async def clear(self) -> None:
         """Clear all cache entries."""
         if not self._db:
             await self.initialize()
 
-        await self._db.execute("DELETE FROM cache")
-        await self._db.commit()
+        async with self._write_lock:
+            await self._db.execute("DELETE FROM cache")
+
+    async def _tick(self) -> None:
+        """Refresh the coarse clock used for expiry timestamps."""
+        while True:
+            self._now = int(time.time())
+            await asyncio.sleep(self.CLOCK_RESOLUTION)
+
+    async def _cleanup_loop(self) -> None:
+        """Periodically remove expired entries."""
+        while True:
+            await asyncio.sleep(self.CLEANUP_INTERVAL)
+            try:
+                await self._cleanup_expired()
+            except Exception as e:
+                logger.error("SQLite cache cleanup error", error=str(e))
 
     async def _cleanup_expired(self) -> None:
         """Remove expired entries."""
-        cursor = await self._db.execute(
-            """
-            DELETE FROM cache 
-            WHERE expires_at IS NOT NULL AND expires_at <= ?
-        """,
-            (int(time.time()),),
-        )
+        async with self._write_lock:
+            cursor = await self._db.execute(self._SQL_CLEAN, (self._now,))
 
         if cursor.rowcount > 0:
-            self.stats.evictions += cursor.rowcount
-            await self._db.commit()
+            self.stats.counters[EVICTIONS] += cursor.rowcount
 
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
         return self.stats.to_dict()
 
 
+class NegativeCache:
+    """
+    Keys recently confirmed absent from every cache level.
+
+    Entries live in two rotating generations of plain sets: new misses go
+    into the current one, and on rotation the previous generation is
+    dropped. Memory is bounded by maxsize and an entry is forgotten at most
+    2 * ttl seconds after it was recorded, which bounds staleness for writes
+    made by other processes. Unlike a Bloom filter, a key can be removed as
+    soon as it is written locally.
+    """
+
+    __slots__ = ("_current", "_previous", "_generation_size", "_ttl", "_rotated_at")
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 5.0):
+        self._current: set = set()
+        self._previous: set = set()
+        self._generation_size = max(1, maxsize // 2)
+        self._ttl = ttl
+        self._rotated_at = time.monotonic()
+
+    def __contains__(self, key: str) -> bool:
+        now = time.monotonic()
+        if now - self._rotated_at >= self._ttl:
+            self._rotate(now)
+        return key in self._current or key in self._previous
+
+    def add(self, key: str) -> None:
+        """Record key as absent."""
+        self._current.add(key)
+        if len(self._current) >= self._generation_size:
+            self._rotate(time.monotonic())
+
+    def discard(self, key: str) -> None:
+        """Forget key, e.g. because it was just written."""
+        self._current.discard(key)
+        self._previous.discard(key)
+
+    def clear(self) -> None:
+        """Forget all keys."""
+        self._current = set()
+        self._previous = set()
+
+    def _rotate(self, now: float) -> None:
+        # After a full idle period the current generation is stale as well
+        if now - self._rotated_at >= 2 * self._ttl:
+            self._previous = set()
+        else:
+            self._previous = self._current
+        self._current = set()
+        self._rotated_at = now
+
+
 class CacheManager:
     """
     Multi-level caching with:
-    - L1: In-memory cache (LRU, 1000 items)
+    - L1: In-memory cache (W-TinyLFU, 1000 items)
     - L2: Redis cache (optional, for distributed)
     - L3: SQLite cache (persistent)
     """
@@ -303,13 +849,28 @@ class CacheManager:
         l1_size: int = 1000,
         l2_redis_url: Optional[str] = None,
         l2_ttl: int = 3600,
+        l2_max_connections: int = 20,
         l3_db_path: str = "./data/cache.db",
+        negative_size: int = 10_000,
+        negative_ttl: float = 5.0,
     ):
         self.l1_cache = L1Cache(maxsize=l1_size)
-        self.l2_cache = L2Cache(redis_url=l2_redis_url, ttl=l2_ttl)
+        self.l2_cache = L2Cache(
+            redis_url=l2_redis_url, ttl=l2_ttl, max_connections=l2_max_connections
+        )
         self.l3_cache = L3Cache(db_path=l3_db_path)
+        self._negative = NegativeCache(maxsize=negative_size, ttl=negative_ttl)
+        # Bumped on every write so a lookup racing a set() does not record
+        # the key as absent after the write landed
+        self._write_epoch = 0
 
         self._initialized = False
+        # Keys with a background L2 promotion in flight, plus the tasks
+        # themselves so they are not garbage collected before finishing
+        self._promoting: set = set()
+        self._promotion_tasks: set = set()
+        # Single-flight L2/L3 lookups: concurrent misses on a key share one walk
+        self._inflight: Dict[str, asyncio.Future] = {}
 
     async def initialize(self) -> None:
         """Initialize cache manager."""
@@ -328,6 +889,8 @@ class CacheManager:
 
     async def close(self) -> None:
         """Close all cache connections."""
+        if self._promotion_tasks:
+            await asyncio.gather(*self._promotion_tasks, return_exceptions=True)
         await self.l2_cache.close()
         await self.l3_cache.close()
 
@@ -335,28 +898,121 @@ class CacheManager:
         """
         Get value from cache.
         Checks L1 -> L2 -> L3 in order.
+
+        Concurrent L1 misses on the same key wait for a single L2/L3 lookup
+        instead of each querying the lower levels, and keys that recently
+        missed everywhere are answered from the negative cache.
         """
         # Try L1 cache first
-        value = await self.l1_cache.get(key)
+        value = self.l1_cache.get_sync(key)
         if value is not None:
             return value
 
+        if key in self._negative:
+            return None
+
+        inflight = self._inflight.get(key)
+        while inflight is not None:
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    # This caller was cancelled, not the lookup
+                    raise
+            # The leading caller was cancelled; look again, leading if needed
+            inflight = self._inflight.get(key)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        epoch = self._write_epoch
+        try:
+            value = await self._get_lower(key)
+            if value is None and epoch == self._write_epoch:
+                self._negative.add(key)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters (if any) re-raise it; don't warn when there are none
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            del self._inflight[key]
+
+    async def _get_lower(self, key: str) -> Optional[Any]:
+        """Look a key up in L2 then L3, promoting hits."""
         # Try L2 cache
         value = await self.l2_cache.get(key)
         if value is not None:
             # Promote to L1
-            await self._promote(key, value, to_level=1)
+            self._promote(key, value, to_level=1)
             return value
 
         # Try L3 cache
         value = await self.l3_cache.get(key)
         if value is not None:
             # Promote to L1 and L2
-            await self._promote(key, value, to_level=2)
+            self._promote(key, value, to_level=2)
             return value
 
         return None
 
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Get several values from cache.
+
+        Each level is queried once for the keys still missing (L1 -> L2 ->
+        L3) and hits are promoted like in get(). Missing keys are omitted.
+        """
+        found: Dict[str, Any] = {}
+        missing = []
+        negative = self._negative
+        for key in keys:
+            value = self.l1_cache.get_sync(key)
+            if value is not None:
+                found[key] = value
+            elif key not in negative:
+                missing.append(key)
+
+        epoch = self._write_epoch
+
+        if missing:
+            l2_found = await self.l2_cache.get_many(missing)
+            for key, value in l2_found.items():
+                self.l1_cache.set_sync(key, value)
+            self.l1_cache.stats.counters[PROMOTIONS] += len(l2_found)
+            found.update(l2_found)
+            missing = [key for key in missing if key not in l2_found]
+
+        if missing:
+            l3_found = await self.l3_cache.get_many(missing)
+            for key, value in l3_found.items():
+                self.l1_cache.set_sync(key, value)
+            self.l1_cache.stats.counters[PROMOTIONS] += len(l3_found)
+            if l3_found and self.l2_cache.enabled:
+                promote = {
+                    key: value
+                    for key, value in l3_found.items()
+                    if key not in self._promoting
+                }
+                if promote:
+                    self._schedule_promotion(
+                        list(promote), self.l2_cache.set_many(promote)
+                    )
+                    self.l2_cache.stats.counters[PROMOTIONS] += len(promote)
+            found.update(l3_found)
+
+            if epoch == self._write_epoch:
+                for key in missing:
+                    if key not in l3_found:
+                        negative.add(key)
+
+        return found
+
     async def set(
         self,
         key: str,
@@ -376,21 +1032,39 @@ class CacheManager:
         if levels is None:
             levels = [1, 2, 3]
 
-        # Set in specified levels
+        self._write_epoch += 1
+        self._negative.discard(key)
+
+        # L1 is in-memory; the remote levels are written concurrently
         if 1 in levels:
-            await self.l1_cache.set(key, value)
+            self.l1_cache.set_sync(key, value)
 
+        writes = []
         if 2 in levels:
-            await self.l2_cache.set(key, value)
+            writes.append(self.l2_cache.set(key, value))
 
         if 3 in levels:
-            await self.l3_cache.set(key, value, ttl=ttl)
+            writes.append(self.l3_cache.set(key, value, ttl=ttl))
+
+        await asyncio.gather(*writes)
 
     async def delete(self, key: str) -> None:
         """Delete value from all cache levels."""
-        await self.l1_cache.delete(key)
-        await self.l2_cache.delete(key)
-        await self.l3_cache.delete(key)
+        self.l1_cache.delete_sync(key)
+        await asyncio.gather(
+            self.l2_cache.delete(key),
+            self.l3_cache.delete(key),
+        )
+
+    async def delete_many(self, keys: List[str]) -> None:
+        """Delete several values from all cache levels in bulk."""
+        for key in keys:
+            self.l1_cache.delete_sync(key)
+
+        await asyncio.gather(
+            self.l2_cache.delete_many(keys),
+            self.l3_cache.delete_many(keys),
+        )
 
     async def clear(self, levels: Optional[list] = None) -> None:
         """
@@ -403,23 +1077,47 @@ class CacheManager:
             levels = [1, 2, 3]
 
         if 1 in levels:
-            await self.l1_cache.clear()
+            self.l1_cache.clear_sync()
 
+        clears = []
         if 2 in levels:
-            await self.l2_cache.clear()
+            clears.append(self.l2_cache.clear())
 
         if 3 in levels:
-            await self.l3_cache.clear()
+            clears.append(self.l3_cache.clear())
+
+        await asyncio.gather(*clears)
 
-    async def _promote(self, key: str, value: Any, to_level: int) -> None:
-        """Promote value to higher cache levels."""
+    def _promote(self, key: str, value: Any, to_level: int) -> None:
+        """
+        Promote value to higher cache levels.
+
+        The L2 write runs in the background so an L3 hit does not pay an
+        extra Redis round trip; concurrent promotions of a key coalesce.
+        """
         if to_level >= 1:
-            await self.l1_cache.set(key, value)
-            self.l1_cache.stats.promotions += 1
+            self.l1_cache.set_sync(key, value)
+            self.l1_cache.stats.counters[PROMOTIONS] += 1
 
-        if to_level >= 2 and self.l2_cache.enabled:
-            await self.l2_cache.set(key, value)
-            self.l2_cache.stats.promotions += 1
+        if (
+            to_level >= 2
+            and self.l2_cache.enabled
+            and key not in self._promoting
+        ):
+            self._schedule_promotion([key], self.l2_cache.set(key, value))
+            self.l2_cache.stats.counters[PROMOTIONS] += 1
+
+    def _schedule_promotion(self, keys: List[str], write: Any) -> None:
+        """Run an L2 promotion write in the background."""
+        self._promoting.update(keys)
+        task = asyncio.create_task(write)
+        self._promotion_tasks.add(task)
+
+        def _done(task: asyncio.Task) -> None:
+            self._promotion_tasks.discard(task)
+            self._promoting.difference_update(keys)
+
+        task.add_done_callback(_done)
 
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics for all levels."""
@@ -457,7 +1155,15 @@ class CacheManager:
 
     async def warm_cache(self, keys_values: Dict[str, Any]) -> None:
         """Pre-populate cache with known values."""
+        self._write_epoch += 1
         for key, value in keys_values.items():
-            await self.set(key, value)
+            self.l1_cache.set_sync(key, value)
+            self._negative.discard(key)
+
+        # One Redis pipeline and one SQLite transaction for the whole batch
+        await asyncio.gather(
+            self.l2_cache.set_many(keys_values),
+            self.l3_cache.set_many(keys_values),
+        )
 
         logger.info("Cache warmed", count=len(keys_values))
@@ -3,7 +3,7 @@
 import os
 from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 from pydantic import EmailStr, Field, HttpUrl, SecretStr, field_validator
 from pydantic.types import DirectoryPath
@@ -116,6 +116,9 @@ class Config(BaseSettings):
         "env_prefix": "",
         "case_sensitive": False,
         "extra": "ignore",
+        # Settings are read-only after load: the cached instance is immutable,
+        # so every caller can safely share it
+        "frozen": True,
     }
 
     def get_rate_limit_config(self):
@@ -138,3 +141,14 @@ class Config(BaseSettings):
 def get_config() -> Config:
     """Get cached configuration instance."""
     return Config()
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve ``CONFIG`` to the shared instance on first import."""
+    # Built lazily: required settings may be absent when the package is
+    # merely imported (tooling, tests), which would fail an eager Config().
+    if name == "CONFIG":
+        config = get_config()
+        globals()["CONFIG"] = config
+        return config
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
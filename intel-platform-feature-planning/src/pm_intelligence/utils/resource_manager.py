@@ -1,115 +1,429 @@
 """Resource management for concurrent operations and rate limiting."""
 
 import asyncio
+import math
 import time
-from collections import defaultdict, deque
+from array import array
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Literal, NamedTuple, Optional
 
 import structlog
 
+from pm_intelligence.utils._logging import debug_enabled
+
 logger = structlog.get_logger(__name__)
 
+# Monotonic clock for token refills and wait accounting. It is what the
+# default event loop's time() reads, but needs no loop at construction
+_clock = time.monotonic
+
 
 @dataclass
 class RateLimitConfig:
     """Configuration for rate limiting."""
 
-    requests_per_minute: int
+    requests_per_minute: Optional[int]  # None or <= 0 means unlimited
     burst_size: int = 10
     window_size: int = 60  # seconds
+    algorithm: Literal["token_bucket", "sliding_window", "fixed_window"] = (
+        "token_bucket"
+    )
+
+
+class _TokenBucketStrategy:
+    """Refill at a steady rate, allowing bursts of up to burst_size."""
+
+    __slots__ = ("rate", "capacity", "tokens", "last_update")
+
+    def __init__(self, rate: float, burst_size: int, window_size: int):
+        self.rate = rate
+        self.capacity = burst_size
+        self.tokens = float(burst_size)
+        self.last_update = _clock()
+
+    def available(self, now: float) -> float:
+        """Tokens that could be taken at now."""
+        return min(self.capacity, self.tokens + (now - self.last_update) * self.rate)
+
+    def take(self, tokens: int, now: float) -> float:
+        """Take tokens, or return the seconds to wait before retrying."""
+        self.tokens = self.available(now)
+        self.last_update = now
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return 0.0
+        return (tokens - self.tokens) / self.rate
+
+    def refund(self, tokens: int) -> None:
+        """Return tokens taken by a request that did not go ahead."""
+        self.tokens = min(self.capacity, self.tokens + tokens)
+
+
+class _FixedWindowStrategy:
+    """Allow a fixed number of requests per window_size window."""
+
+    __slots__ = ("capacity", "window_size", "count", "window_start")
+
+    def __init__(self, rate: float, burst_size: int, window_size: int):
+        self.capacity = rate * window_size
+        self.window_size = window_size
+        self.count = 0
+        self.window_start = _clock()
+
+    def _roll(self, now: float) -> None:
+        elapsed = now - self.window_start
+        if elapsed >= self.window_size:
+            self.window_start = now - elapsed % self.window_size
+            self.count = 0
+
+    def available(self, now: float) -> float:
+        """Tokens that could be taken at now."""
+        self._roll(now)
+        return self.capacity - self.count
+
+    def take(self, tokens: int, now: float) -> float:
+        """Take tokens, or return the seconds to wait before retrying."""
+        self._roll(now)
+        if self.count + tokens <= self.capacity:
+            self.count += tokens
+            return 0.0
+        return self.window_start + self.window_size - now
+
+    def refund(self, tokens: int) -> None:
+        """Return tokens taken by a request that did not go ahead."""
+        self.count = max(0, self.count - tokens)
+
+
+class _SlidingWindowStrategy:
+    """
+    Approximate a sliding window from the current and previous fixed
+    windows, weighting the previous count by how much of it still overlaps.
+
+    Unlike a fixed window this does not allow twice the limit across a
+    window boundary, and unlike a sliding log it needs O(1) memory.
+    """
+
+    __slots__ = ("capacity", "window_size", "count", "previous", "window_start")
+
+    def __init__(self, rate: float, burst_size: int, window_size: int):
+        self.capacity = rate * window_size
+        self.window_size = window_size
+        self.count = 0
+        self.previous = 0
+        self.window_start = _clock()
+
+    def _roll(self, now: float) -> float:
+        elapsed = now - self.window_start
+        if elapsed >= self.window_size:
+            self.previous = self.count if elapsed < 2 * self.window_size else 0
+            self.count = 0
+            elapsed %= self.window_size
+            self.window_start = now - elapsed
+        return elapsed
+
+    def available(self, now: float) -> float:
+        """Tokens that could be taken at now."""
+        overlap = 1.0 - self._roll(now) / self.window_size
+        return self.capacity - self.count - self.previous * overlap
+
+    def take(self, tokens: int, now: float) -> float:
+        """Take tokens, or return the seconds to wait before retrying."""
+        overlap = 1.0 - self._roll(now) / self.window_size
+        headroom = self.capacity - self.count - tokens
+        if self.previous * overlap <= headroom:
+            self.count += tokens
+            return 0.0
+
+        window_end = self.window_start + self.window_size
+        if headroom < 0:
+            # The current window alone is over the limit
+            return window_end - now
+        # Wait until enough of the previous window has slid out
+        return window_end - self.window_size * headroom / self.previous - now
+
+    def refund(self, tokens: int) -> None:
+        """Return tokens taken by a request that did not go ahead."""
+        self.count = max(0, self.count - tokens)
+
+
+class _UnlimitedStrategy:
+    """No limit; used when requests_per_minute is None or not positive."""
+
+    __slots__ = ()
+
+    capacity = math.inf
+
+    def available(self, now: float) -> float:
+        """Tokens that could be taken at now."""
+        return math.inf
+
+    def take(self, tokens: int, now: float) -> float:
+        """Take tokens; never waits."""
+        return 0.0
+
+    def refund(self, tokens: int) -> None:
+        """Nothing to return."""
+
+
+_STRATEGIES = {
+    "token_bucket": _TokenBucketStrategy,
+    "sliding_window": _SlidingWindowStrategy,
+    "fixed_window": _FixedWindowStrategy,
+}
+
+
+class Availability(NamedTuple):
+    """Current availability of a resource type."""
+
+    available: bool
+    active: int
+    limit: int
+    utilization: float
+
+
+# Availability of resource types without a semaphore
+_UNLIMITED = Availability(available=True, active=0, limit=0, utilization=0.0)
 
 
 class RateLimiter:
-    """Token bucket rate limiter."""
+    """Rate limiter using a token bucket, sliding or fixed window."""
+
+    # Recent wait times kept (as raw doubles) for wait_percentile()
+    WAIT_SAMPLES = 1000
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[int],
+        burst_size: int = 10,
+        window_size: int = 60,
+        algorithm: str = "token_bucket",
+    ):
+        if algorithm not in _STRATEGIES:
+            raise ValueError(
+                f"Unknown rate limit algorithm {algorithm!r}. "
+                f"Must be one of: {list(_STRATEGIES)}"
+            )
 
-    def __init__(self, requests_per_minute: int, burst_size: int = 10):
-        self.rate = requests_per_minute / 60.0  # requests per second
         self.burst_size = burst_size
-        self.tokens = float(burst_size)
-        self.last_update = time.time()
-        self._lock = asyncio.Lock()
+        self.algorithm = algorithm
+        self.unlimited = requests_per_minute is None or requests_per_minute <= 0
+        if self.unlimited:
+            self.rate = math.inf
+            self._strategy = _UnlimitedStrategy()
+            # Nothing to wait for, so skip the clock and waiter tracking entirely
+            self.acquire = self._acquire_unlimited
+            self.try_acquire = self._try_acquire_unlimited
+        else:
+            self.rate = requests_per_minute / 60.0  # requests per second
+            self._strategy = _STRATEGIES[algorithm](self.rate, burst_size, window_size)
+        # Callers currently sleeping in acquire() until tokens free up. The
+        # token math needs no lock as it never awaits between reading and
+        # updating the bucket, and waiters sleep without holding anything
+        self._waiting = 0
 
         # Statistics
         self.total_requests = 0
         self.rejected_requests = 0
-        self.wait_times = deque(maxlen=1000)
+
+        # Wait times are aggregated per fixed window of window_size seconds;
+        # the last complete window is kept so stats don't drop to zero
+        # right after a rollover
+        self.window_size = window_size
+        self._window_start = _clock()
+        self._wait_count = 0
+        self._wait_sum = 0.0
+        self._wait_max = 0.0
+        self._prev_count = 0
+        self._prev_sum = 0.0
+        self._prev_max = 0.0
+
+        # Ring buffer of the most recent waits; _wait_next is the slot the
+        # next sample goes into and _wait_samples how many slots are filled
+        self._waits = array("d", [0.0]) * self.WAIT_SAMPLES
+        self._wait_next = 0
+        self._wait_samples = 0
+
+    @property
+    def tokens(self) -> float:
+        """Requests that could be made right now."""
+        return self._strategy.available(_clock())
+
+    def _roll_window(self, now: float) -> None:
+        """Start a new stats window if the current one has ended."""
+        elapsed = now - self._window_start
+        if elapsed < self.window_size:
+            return
+
+        if elapsed < 2 * self.window_size:
+            self._prev_count = self._wait_count
+            self._prev_sum = self._wait_sum
+            self._prev_max = self._wait_max
+        else:
+            # No waits recorded for a full window
+            self._prev_count = 0
+            self._prev_sum = 0.0
+            self._prev_max = 0.0
+
+        self._window_start = now - elapsed % self.window_size
+        self._wait_count = 0
+        self._wait_sum = 0.0
+        self._wait_max = 0.0
+
+    def _record_wait(self, wait_time: float, now: float) -> None:
+        """Add a wait time to the current window."""
+        self._roll_window(now)
+        self._wait_count += 1
+        self._wait_sum += wait_time
+        if wait_time > self._wait_max:
+            self._wait_max = wait_time
+
+        index = self._wait_next
+        self._waits[index] = wait_time
+        self._wait_next = (index + 1) % self.WAIT_SAMPLES
+        if self._wait_samples < self.WAIT_SAMPLES:
+            self._wait_samples += 1
+
+    def wait_percentile(self, fraction: float) -> float:
+        """
+        Wait time at the given fraction (e.g. 0.95) of the recent samples.
+
+        Sorts the samples on every call, so it is kept out of get_stats().
+        """
+        if not self._wait_samples:
+            return 0.0
+        samples = sorted(self._waits[: self._wait_samples])
+        return samples[int(fraction * (len(samples) - 1))]
 
     async def acquire(self, tokens: int = 1) -> float:
         """
         Acquire tokens from the bucket.
         Returns wait time if rate limited.
         """
-        async with self._lock:
-            now = time.time()
-
-            # Add tokens based on time elapsed
-            elapsed = now - self.last_update
-            self.tokens = min(self.burst_size, self.tokens + elapsed * self.rate)
-            self.last_update = now
+        if tokens > self._strategy.capacity:
+            raise ValueError(
+                f"Cannot acquire {tokens} tokens; limit is {self._strategy.capacity}"
+            )
 
-            self.total_requests += 1
+        self.total_requests += 1
+        take = self._strategy.take
 
-            # Check if we have enough tokens
-            if self.tokens >= tokens:
-                self.tokens -= tokens
-                self.wait_times.append(0.0)
+        # Fast path: take available tokens unless earlier callers are waiting
+        if not self._waiting:
+            now = _clock()
+            if take(tokens, now) == 0.0:
+                self._record_wait(0.0, now)
                 return 0.0
-            else:
-                # Calculate wait time
-                deficit = tokens - self.tokens
-                wait_time = deficit / self.rate
-
-                # Wait and then acquire
-                await asyncio.sleep(wait_time)
-
-                # Update tokens after wait
-                self.tokens = 0.0
-                self.last_update = time.time()
 
-                self.wait_times.append(wait_time)
-                return wait_time
+        start = _clock()
+        self._waiting += 1
+        try:
+            while True:
+                now = _clock()
+                delay = take(tokens, now)
+                if delay == 0.0:
+                    wait_time = now - start
+                    self._record_wait(wait_time, now)
+                    return wait_time
+
+                # Sleep until enough capacity should be free, then re-check;
+                # nothing is held meanwhile, so other waiters proceed as soon
+                # as their own tokens are available
+                await asyncio.sleep(delay)
+        finally:
+            self._waiting -= 1
+
+    async def _acquire_unlimited(self, tokens: int = 1) -> float:
+        """acquire() for limiters without a rate limit."""
+        self.total_requests += 1
+        return 0.0
+
+    async def _try_acquire_unlimited(self, tokens: int = 1) -> bool:
+        """try_acquire() for limiters without a rate limit."""
+        self.total_requests += 1
+        return True
 
     async def try_acquire(self, tokens: int = 1) -> bool:
         """
         Try to acquire tokens without waiting.
         Returns True if successful, False otherwise.
         """
-        async with self._lock:
-            now = time.time()
+        self.total_requests += 1
 
-            # Add tokens based on time elapsed
-            elapsed = now - self.last_update
-            self.tokens = min(self.burst_size, self.tokens + elapsed * self.rate)
-            self.last_update = now
+        # Don't take tokens that callers blocked in acquire() are waiting for
+        if not self._waiting:
+            if self._strategy.take(tokens, _clock()) == 0.0:
+                return True
 
-            self.total_requests += 1
+        self.rejected_requests += 1
+        return False
 
-            # Check if we have enough tokens
-            if self.tokens >= tokens:
-                self.tokens -= tokens
-                return True
-            else:
-                self.rejected_requests += 1
-                return False
+    def refund(self, tokens: int = 1) -> None:
+        """Give back tokens from an acquire whose request was abandoned."""
+        self._strategy.refund(tokens)
 
     def get_stats(self) -> Dict[str, Any]:
         """Get rate limiter statistics."""
-        avg_wait = (
-            sum(self.wait_times) / len(self.wait_times) if self.wait_times else 0.0
-        )
+        self._roll_window(_clock())
+        count = self._wait_count + self._prev_count
+        avg_wait = (self._wait_sum + self._prev_sum) / count if count else 0.0
 
         return {
             "total_requests": self.total_requests,
             "rejected_requests": self.rejected_requests,
             "rejection_rate": self.rejected_requests / max(1, self.total_requests),
             "average_wait_time": avg_wait,
+            "max_wait_time": max(self._wait_max, self._prev_max),
             "current_tokens": self.tokens,
-            "max_tokens": self.burst_size,
+            "max_tokens": self._strategy.capacity,
+            "algorithm": self.algorithm,
             "rate_per_second": self.rate,
         }
 
 
+class _Semaphore(asyncio.Semaphore):
+    """Semaphore that can be acquired without awaiting."""
+
+    def try_acquire(self) -> bool:
+        """Take a slot if one is free right now (respecting waiters)."""
+        if self.locked():
+            return False
+        # Same bookkeeping as acquire()'s uncontended path
+        self._value -= 1
+        return True
+
+    def release_many(self, count: int) -> None:
+        """Release count slots at once."""
+        release = self.release
+        for _ in range(count):
+            release()
+
+
+class _ResourceStats:
+    """Usage counters for one resource type."""
+
+    __slots__ = ("active", "total_acquired", "total_wait_time", "max_concurrent")
+
+    def __init__(self):
+        self.active = 0
+        self.total_acquired = 0
+        self.total_wait_time = 0.0
+        self.max_concurrent = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "active": self.active,
+            "total_acquired": self.total_acquired,
+            "total_wait_time": self.total_wait_time,
+            "max_concurrent": self.max_concurrent,
+        }
+
+
+# Read-only stand-in for resource types that were never used; looking one
+# up must not create stats, or arbitrary names would grow _usage_stats
+_EMPTY_STATS = _ResourceStats()
+
+
 class ResourceManager:
     """
     Manages system resources efficiently:
@@ -119,22 +433,24 @@ class ResourceManager:
     - Performance monitoring
     """
 
-    def __init__(self):
+    def __init__(self, stats_ttl: float = 1.0):
         # Semaphores for concurrent operations
-        self.semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.semaphores: Dict[str, _Semaphore] = {}
+
+        # get_stats() for all resources is reused for stats_ttl seconds so
+        # frequent metric scrapes don't rebuild it; 0 disables the reuse
+        self.stats_ttl = stats_ttl
+        self._stats_cache: Optional[Dict[str, Any]] = None
+        self._stats_cache_at = 0.0
 
         # Rate limiters for API calls
         self.rate_limiters: Dict[str, RateLimiter] = {}
 
+        # Per-resource loggers; acquire/release only log when debug is on
+        self._loggers: Dict[str, Any] = {}
+
         # Resource usage tracking
-        self._usage_stats = defaultdict(
-            lambda: {
-                "active": 0,
-                "total_acquired": 0,
-                "total_wait_time": 0.0,
-                "max_concurrent": 0,
-            }
-        )
+        self._usage_stats: Dict[str, _ResourceStats] = {}
 
         # Default configurations
         self._default_configs = {
@@ -160,22 +476,64 @@ class ResourceManager:
         self._initialize_resources()
 
     def _initialize_resources(self) -> None:
-        """Initialize semaphores and rate limiters."""
-        for resource_type, config in self._default_configs.items():
-            # Create semaphore
-            self.semaphores[resource_type] = asyncio.Semaphore(config["max_concurrent"])
-
-            # Create rate limiter
-            rate_config = config["rate_limit"]
-            self.rate_limiters[resource_type] = RateLimiter(
-                requests_per_minute=rate_config.requests_per_minute,
-                burst_size=rate_config.burst_size,
-            )
+        """Prepare resource defaults; semaphores and limiters are lazy."""
+        # Fallbacks for resource types without their own entry; the default
+        # limiter is built on first use
+        self._default_config = self._default_configs["default"]
+        self._default_rate_limiter: Optional[RateLimiter] = None
 
         logger.info(
-            "Resource manager initialized", resources=list(self.semaphores.keys())
+            "Resource manager initialized",
+            resources=list(self._default_configs.keys()),
         )
 
+    @staticmethod
+    def _make_rate_limiter(config: RateLimitConfig) -> RateLimiter:
+        """Build a rate limiter from its configuration."""
+        return RateLimiter(
+            requests_per_minute=config.requests_per_minute,
+            burst_size=config.burst_size,
+            window_size=config.window_size,
+            algorithm=config.algorithm,
+        )
+
+    def _ensure_stats(self, resource_type: str) -> _ResourceStats:
+        """Get the resource's usage stats, creating them on first use."""
+        stats = self._usage_stats.get(resource_type)
+        if stats is None:
+            stats = self._usage_stats[resource_type] = _ResourceStats()
+            self._stats_cache = None
+        return stats
+
+    def _semaphore(self, resource_type: str) -> _Semaphore:
+        """Get the resource's semaphore, creating it on first use."""
+        semaphore = self.semaphores.get(resource_type)
+        if semaphore is None:
+            config = self._default_configs.get(resource_type, self._default_config)
+            semaphore = self.semaphores[resource_type] = _Semaphore(
+                config["max_concurrent"]
+            )
+            self._stats_cache = None
+        return semaphore
+
+    def _rate_limiter(self, resource_type: str) -> RateLimiter:
+        """Get the resource's rate limiter, creating it on first use."""
+        limiter = self.rate_limiters.get(resource_type)
+        if limiter is None:
+            config = self._default_configs.get(resource_type)
+            if config is None:
+                # Resource types without defaults share the default limiter
+                limiter = self._default_rate_limiter
+                if limiter is None:
+                    limiter = self._default_rate_limiter = self._rate_limiter(
+                        "default"
+                    )
+                return limiter
+            limiter = self.rate_limiters[resource_type] = self._make_rate_limiter(
+                config["rate_limit"]
+            )
+        return limiter
+
     def configure_resource(
         self,
         resource_type: str,
@@ -183,8 +541,11 @@ class ResourceManager:
         rate_limit: Optional[RateLimitConfig] = None,
     ) -> None:
         """Configure resource limits."""
+        self._stats_cache = None
+
         if max_concurrent is not None:
-            self.semaphores[resource_type] = asyncio.Semaphore(max_concurrent)
+            self.semaphores[resource_type] = _Semaphore(max_concurrent)
+            self._ensure_stats(resource_type)
             logger.info(
                 "Updated concurrency limit",
                 resource=resource_type,
@@ -192,10 +553,9 @@ class ResourceManager:
             )
 
         if rate_limit is not None:
-            self.rate_limiters[resource_type] = RateLimiter(
-                requests_per_minute=rate_limit.requests_per_minute,
-                burst_size=rate_limit.burst_size,
-            )
+            self.rate_limiters[resource_type] = self._make_rate_limiter(rate_limit)
+            if resource_type == "default":
+                self._default_rate_limiter = self.rate_limiters["default"]
             logger.info(
                 "Updated rate limit",
                 resource=resource_type,
@@ -208,60 +568,68 @@ class ResourceManager:
 
         Returns True if acquired, False if not available and wait=False.
         """
-        # Get or create semaphore
-        if resource_type not in self.semaphores:
-            config = self._default_configs.get("default")
-            self.semaphores[resource_type] = asyncio.Semaphore(config["max_concurrent"])
-
-        semaphore = self.semaphores[resource_type]
+        semaphore = self._semaphore(resource_type)
 
         # Try to acquire semaphore
-        start_time = time.time()
+        start_time = _clock()
 
         if wait:
             await semaphore.acquire()
             acquired = True
         else:
-            acquired = semaphore.locked() == False
-            if acquired:
-                await semaphore.acquire()
+            acquired = semaphore.try_acquire()
 
         if acquired:
             # Check rate limit
-            rate_limiter = self.rate_limiters.get(
-                resource_type, self.rate_limiters["default"]
-            )
+            rate_limiter = self._rate_limiter(resource_type)
 
-            wait_time = await rate_limiter.acquire()
+            try:
+                wait_time = await rate_limiter.acquire()
+            except BaseException:
+                # Cancelled or failed while rate limited; give the slot back
+                semaphore.release()
+                raise
 
             # Update statistics
-            stats = self._usage_stats[resource_type]
-            stats["active"] += 1
-            stats["total_acquired"] += 1
-            stats["total_wait_time"] += time.time() - start_time
-            stats["max_concurrent"] = max(stats["max_concurrent"], stats["active"])
-
-            logger.debug(
-                "Resource acquired",
-                resource=resource_type,
-                active=stats["active"],
-                wait_time=wait_time,
-            )
+            stats = self._ensure_stats(resource_type)
+            stats.active += 1
+            stats.total_acquired += 1
+            stats.total_wait_time += _clock() - start_time
+            if stats.active > stats.max_concurrent:
+                stats.max_concurrent = stats.active
+
+            if debug_enabled(logger):
+                self._logger(resource_type).debug(
+                    "Resource acquired", active=stats.active, wait_time=wait_time
+                )
 
         return acquired
 
-    def release(self, resource_type: str) -> None:
-        """Release resource after operation."""
-        if resource_type in self.semaphores:
-            self.semaphores[resource_type].release()
+    def release(self, resource_type: str, count: int = 1) -> None:
+        """Release count units of a resource after operation."""
+        semaphore = self.semaphores.get(resource_type)
+        if semaphore is None:
+            return
 
-            # Update statistics
-            stats = self._usage_stats[resource_type]
-            stats["active"] = max(0, stats["active"] - 1)
+        if count == 1:
+            semaphore.release()
+        else:
+            semaphore.release_many(count)
 
-            logger.debug(
-                "Resource released", resource=resource_type, active=stats["active"]
-            )
+        # Update statistics
+        stats = self._ensure_stats(resource_type)
+        active = stats.active - count
+        stats.active = active if active > 0 else 0
+
+        if debug_enabled(logger):
+            self._logger(resource_type).debug("Resource released", active=stats.active)
+
+    def _logger(self, resource_type: str) -> Any:
+        """Logger bound to resource_type."""
+        bound = self._loggers.get(resource_type)
+        if bound is None:
+            bound = self._loggers[resource_type] = logger.bind(resource=resource_type)
+        return bound
 
     async def acquire_multiple(
         self, resources: Dict[str, int], wait: bool = True
@@ -276,87 +644,105 @@ class ResourceManager:
         Returns:
             True if all acquired, False otherwise
         """
-        acquired = []
+        acquired: Dict[str, int] = {}
 
         try:
-            for resource_type, count in resources.items():
+            # Acquire in a fixed (sorted) order so callers asking for the
+            # same resources in a different order cannot deadlock
+            for resource_type, count in sorted(resources.items()):
                 for _ in range(count):
-                    if await self.acquire(resource_type, wait=wait):
-                        acquired.append(resource_type)
-                    else:
-                        # Failed to acquire, release all
-                        for acq_resource in acquired:
-                            self.release(acq_resource)
+                    if not await self.acquire(resource_type, wait=wait):
+                        self._rollback(acquired)
                         return False
+                    acquired[resource_type] = acquired.get(resource_type, 0) + 1
 
             return True
 
-        except Exception:
-            # Release any acquired resources on error
-            for acq_resource in acquired:
-                self.release(acq_resource)
+        except BaseException:
+            # Release any acquired resources on error or cancellation
+            self._rollback(acquired)
             raise
 
-    def get_availability(self, resource_type: str) -> Dict[str, Any]:
+    def _rollback(self, acquired: Dict[str, int]) -> None:
+        """Release resources and refund their rate limit tokens."""
+        for resource_type, count in acquired.items():
+            self.release(resource_type, count)
+            self._rate_limiter(resource_type).refund(count)
+
+    def get_availability(self, resource_type: str) -> Availability:
         """Get current resource availability."""
         semaphore = self.semaphores.get(resource_type)
+        config = self._default_configs.get(resource_type)
         if not semaphore:
-            return {"available": True, "active": 0, "limit": 0}
+            if config is None:
+                return _UNLIMITED
+            # Configured but not used yet, so nothing is held
+            return Availability(True, 0, config["max_concurrent"], 0.0)
 
-        stats = self._usage_stats[resource_type]
-        config = self._default_configs.get(
-            resource_type, self._default_configs["default"]
-        )
+        active = self._usage_stats.get(resource_type, _EMPTY_STATS).active
+        limit = (config or self._default_config)["max_concurrent"]
 
-        return {
-            "available": not semaphore.locked(),
-            "active": stats["active"],
-            "limit": config["max_concurrent"],
-            "utilization": stats["active"] / config["max_concurrent"],
-        }
+        return Availability(not semaphore.locked(), active, limit, active / limit)
 
     def get_stats(self, resource_type: Optional[str] = None) -> Dict[str, Any]:
         """Get resource usage statistics."""
         if resource_type:
-            stats = self._usage_stats[resource_type]
-            rate_stats = self.rate_limiters.get(
-                resource_type, self.rate_limiters["default"]
-            ).get_stats()
-
-            return {
-                "usage": {
-                    **stats,
-                    "average_wait_time": (
-                        stats["total_wait_time"] / max(1, stats["total_acquired"])
-                    ),
-                },
-                "rate_limiting": rate_stats,
-                "availability": self.get_availability(resource_type),
-            }
-        else:
-            # Return stats for all resources
-            all_stats = {}
+            return self._resource_stats(resource_type)
+
+        # Return stats for all resources
+        now = _clock()
+        if (
+            self._stats_cache is not None
+            and now - self._stats_cache_at < self.stats_ttl
+        ):
+            return self._copy_stats(self._stats_cache)
+
+        resource_stats = self._resource_stats
+        all_stats = {
+            res_type: resource_stats(res_type)
+            for res_type in self.semaphores.keys() | self._usage_stats.keys()
+        }
 
-            for res_type in set(
-                list(self.semaphores.keys()) + list(self._usage_stats.keys())
-            ):
-                all_stats[res_type] = self.get_stats(res_type)
+        self._stats_cache = all_stats
+        self._stats_cache_at = now
+        return self._copy_stats(all_stats)
 
-            return all_stats
+    @staticmethod
+    def _copy_stats(all_stats: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy a stats snapshot so callers can't modify the cached one."""
+        return {
+            res_type: {section: dict(values) for section, values in stats.items()}
+            for res_type, stats in all_stats.items()
+        }
+
+    def _resource_stats(self, resource_type: str) -> Dict[str, Any]:
+        """Build the statistics for one resource type."""
+        stats = self._usage_stats.get(resource_type, _EMPTY_STATS)
+        usage = stats.to_dict()
+        usage["average_wait_time"] = stats.total_wait_time / max(
+            1, stats.total_acquired
+        )
+
+        return {
+            "usage": usage,
+            "rate_limiting": self._rate_limiter(resource_type).get_stats(),
+            "availability": self.get_availability(resource_type)._asdict(),
+        }
 
     def reset_stats(self, resource_type: Optional[str] = None) -> None:
         """Reset usage statistics."""
         if resource_type:
-            self._usage_stats[resource_type] = {
-                "active": self._usage_stats[resource_type]["active"],
-                "total_acquired": 0,
-                "total_wait_time": 0.0,
-                "max_concurrent": self._usage_stats[resource_type]["active"],
-            }
+            stats = self._usage_stats.get(resource_type)
+            if stats is not None:
+                stats.total_acquired = 0
+                stats.total_wait_time = 0.0
+                stats.max_concurrent = stats.active
         else:
             for res_type in self._usage_stats:
                 self.reset_stats(res_type)
 
+        self._stats_cache = None
+
         logger.info("Resource statistics reset", resource=resource_type)
 
 
@@ -374,20 +760,23 @@ class ResourceContext:
 
     async def __aenter__(self):
         """Acquire resources."""
-        for _ in range(self.count):
-            if await self.resource_manager.acquire(self.resource_type):
+        try:
+            for _ in range(self.count):
+                if not await self.resource_manager.acquire(self.resource_type):
+                    raise RuntimeError(
+                        f"Failed to acquire {self.count} {self.resource_type} resources"
+                    )
                 self.acquired += 1
-            else:
-                # Failed to acquire all resources
-                for _ in range(self.acquired):
-                    self.resource_manager.release(self.resource_type)
-                raise RuntimeError(
-                    f"Failed to acquire {self.count} {self.resource_type} resources"
-                )
+        except BaseException:
+            # Roll back a partial acquisition, including on cancellation
+            self.resource_manager._rollback({self.resource_type: self.acquired})
+            self.acquired = 0
+            raise
 
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Release resources."""
-        for _ in range(self.acquired):
-            self.resource_manager.release(self.resource_type)
+        if self.acquired:
+            self.resource_manager.release(self.resource_type, self.acquired)
+            self.acquired = 0